@@ -10,6 +10,7 @@ See `LICENSE` in the root of the repository for details.
 """
 
 from .blocks import *
+from .kernels import *
 from .tiling import *
 from .utils import *
 
@@ -40,6 +40,8 @@ class RobinsonTriangle:
         `V` is at the vertex angle. `A` and `B` define the base.
         `A`-to-`V` and `B`-to-`V` distances must be equal (up to numerical precision).
     """
+    __slots__ = ("A", "vertex", "B")
+
     def __init__(
         self,
         A : Point,
@@ -52,13 +54,25 @@ class RobinsonTriangle:
 
         assert isclose(abs(self.A - self.vertex), abs(self.B - self.vertex))
 
+    @classmethod
+    def _fast_new(
+        cls,
+        A : Point,
+        V : Point,
+        B : Point,
+    ) -> Self:
+        # Skips the checks in `__init__`; for vertices derived from already-validated tiles
+        o = object.__new__(cls)
+        o.A, o.vertex, o.B = A, V, B
+        return o
+
     def leg_length(self) -> float: return abs(self.A - self.vertex)
 
     def base_length(self) -> float: return abs(self.A - self.B)
 
     def base_midpoint(self) -> Point: return (self.A + self.B) / 2
 
-    def center(self) -> Point: return (self.base_midpoint + self.vertex) / 2
+    def center(self) -> Point: return (self.base_midpoint() + self.vertex) / 2
 
     def rhombus_center(self) -> Point: return self.base_midpoint()
 
@@ -124,7 +138,7 @@ class RobinsonTriangle:
     def rhombus_arc_paths(self) -> ArcPathDefns: return self.get_arc_paths(use_rhombus=True)
 
     def conjugate(self) -> RobinsonTriangle:
-        return self.__class__(self.A.conjugate(), self.vertex.conjugate(), self.B.conjugate())
+        return self._fast_new(self.A.conjugate(), self.vertex.conjugate(), self.B.conjugate())
 
 class LargeTile(RobinsonTriangle):
     """
@@ -142,6 +156,8 @@ class LargeTile(RobinsonTriangle):
         `V` is at the vertex angle. `A` and `B` define the base.
         `A`-to-`V` and `B`-to-`V` distances must be equal (up to numerical precision).
     """
+    __slots__ = ()
+
     def __init__(
         self,
         A : Point,
@@ -155,9 +171,9 @@ class LargeTile(RobinsonTriangle):
         D = (PSI_SQUARED * self.A) + (PSI * self.B)
         E = (PSI_SQUARED * self.A) + (PSI * self.vertex)
         return [
-            LargeTile(D, E, self.A),
-            SmallTile(E, D, self.vertex),
-            LargeTile(self.B, D, self.vertex),
+            LargeTile._fast_new(D, E, self.A),
+            SmallTile._fast_new(E, D, self.vertex),
+            LargeTile._fast_new(self.B, D, self.vertex),
         ]
 
 class SmallTile(RobinsonTriangle):
@@ -176,6 +192,8 @@ class SmallTile(RobinsonTriangle):
         `V` is at the vertex angle. `A` and `B` define the base.
         `A`-to-`V` and `B`-to-`V` distances must be equal (up to numerical precision).
     """
+    __slots__ = ()
+
     def __init__(
         self,
         A : Point,
@@ -188,6 +206,6 @@ class SmallTile(RobinsonTriangle):
     def inflate(self) -> list[SmallTile, LargeTile]:
         D = (PSI * self.A) + (PSI_SQUARED * self.vertex)
         return [
-            SmallTile(D, self.B, self.A),
-            LargeTile(self.B, D, self.vertex),
+            SmallTile._fast_new(D, self.B, self.A),
+            LargeTile._fast_new(self.B, D, self.vertex),
         ]
@@ -0,0 +1,83 @@
+"""
+Inflation kernels
+
+P3PenroseTiles
+Copyright (C) 2023 - present, Christian Cahig
+https://github.com/christian-cahig/P3PenroseTiles
+
+This file is part of the repository P3PenroseTiles, and is covered by the CC-BY-4.0 License.
+See `LICENSE` in the root of the repository for details.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+from .utils import PSI, PSI_SQUARED
+
+__all__ = ["HAS_NUMBA", "inflate_large", "inflate_small"]
+
+def _inflate_large_numpy(
+    L : np.ndarray,
+    L_out : np.ndarray,
+    S_out : np.ndarray,
+) -> None:
+    # Large tile (A, V, B) -> large (D, E, A), large (B, D, V), small (E, D, V)
+    # D and E are computed directly in their first output column, sharing `PSI_SQUARED * A`
+    n = L.shape[0]
+    D, E = L_out[:n, 0], L_out[:n, 1]
+    scaled_A = PSI_SQUARED * L[:, 0]
+    np.multiply(PSI, L[:, 2], out=D); D += scaled_A
+    np.multiply(PSI, L[:, 1], out=E); E += scaled_A
+    L_out[:n, 2] = L[:, 0]
+    L_out[n:, 0], L_out[n:, 1], L_out[n:, 2] = L[:, 2], D, L[:, 1]
+    S_out[:, 0], S_out[:, 1], S_out[:, 2] = E, D, L[:, 1]
+
+def _inflate_small_numpy(
+    S : np.ndarray,
+    S_out : np.ndarray,
+    L_out : np.ndarray,
+) -> None:
+    # Small tile (A, V, B) -> small (D, B, A), large (B, D, V)
+    D = S_out[:, 0]
+    np.multiply(PSI, S[:, 0], out=D); D += PSI_SQUARED * S[:, 1]
+    S_out[:, 1], S_out[:, 2] = S[:, 2], S[:, 0]
+    L_out[:, 0], L_out[:, 1], L_out[:, 2] = S[:, 2], D, S[:, 1]
+
+# `fastmath` is left off so that the JIT-compiled kernels round exactly like NumPy does;
+# `Canvas.remove_duplicates` with the default zero `equality-tol` relies on that.
+if HAS_NUMBA:
+    @njit(parallel=True, nogil=True, cache=True)
+    def inflate_large(
+        L : np.ndarray,
+        L_out : np.ndarray,
+        S_out : np.ndarray,
+    ) -> None:
+        n = L.shape[0]
+        for i in prange(n):
+            A, V, B = L[i, 0], L[i, 1], L[i, 2]
+            D = (PSI_SQUARED * A) + (PSI * B)
+            E = (PSI_SQUARED * A) + (PSI * V)
+            L_out[i, 0], L_out[i, 1], L_out[i, 2] = D, E, A
+            L_out[n+i, 0], L_out[n+i, 1], L_out[n+i, 2] = B, D, V
+            S_out[i, 0], S_out[i, 1], S_out[i, 2] = E, D, V
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def inflate_small(
+        S : np.ndarray,
+        S_out : np.ndarray,
+        L_out : np.ndarray,
+    ) -> None:
+        for i in prange(S.shape[0]):
+            A, V, B = S[i, 0], S[i, 1], S[i, 2]
+            D = (PSI * A) + (PSI_SQUARED * V)
+            S_out[i, 0], S_out[i, 1], S_out[i, 2] = D, B, A
+            L_out[i, 0], L_out[i, 1], L_out[i, 2] = B, D, V
+else:
+    inflate_large = _inflate_large_numpy
+    inflate_small = _inflate_small_numpy
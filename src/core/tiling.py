@@ -11,20 +11,25 @@ See `LICENSE` in the root of the repository for details.
 from __future__ import annotations
 
 from numbers import Complex
-from typing import TypeAlias
+from typing import Iterator, TypeAlias
 from typing_extensions import Self
 from os import PathLike
 from pathlib import Path
+from copy import copy as shallow_copy
 
-from math import isclose, sqrt, sin, cos
+from math import sqrt, sin, cos
+
+import numpy as np
 
 from .blocks import Point, SVGPathDefn, LargeTile, SmallTile
-from .utils import PSI
+from .kernels import inflate_large, inflate_small
+from .utils import PSI, PSI_POW
 
 __all__ = ["Canvas", "get_default_config"]
 
 Config : TypeAlias = dict[str, str | float | bool]
 CanvasElements : TypeAlias = list[LargeTile | SmallTile, ...]
+TileArray : TypeAlias = np.ndarray
 
 def get_default_config() -> Config: return {
     "margin" : 0.0,
@@ -32,6 +37,7 @@ def get_default_config() -> Config: return {
     "stroke-color" : "#FFFFFF",
     # 
     "reflect-x" : True,
+    "reflect-x-by-reference" : False,
     "rotation" : 0,
     # 
     "large-tile-color" : "#B31B1B",
@@ -42,6 +48,8 @@ def get_default_config() -> Config: return {
     "equality-tol" : 0,
 }
 
+def _negated(number : str) -> str: return number[1:] if number[0] == "-" else f"-{number}"
+
 class Canvas:
     """
     Canvas containing the P3 Penrose tiling
@@ -87,93 +95,305 @@ class Canvas:
             (isinstance(e, LargeTile) or isinstance(e, SmallTile)) \
                 for e in starting_tiles
         ) if starting_tiles else True
-        self.elements = starting_tiles
+        starting_tiles = starting_tiles or []
+        self.large = self.to_tile_array(
+            [e for e in starting_tiles if isinstance(e, LargeTile)]
+        )
+        self.small = self.to_tile_array(
+            [e for e in starting_tiles if isinstance(e, SmallTile)]
+        )
+        self.mirrored, self.mirror_axis = None, complex(1, 0)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        large : TileArray | None = None,
+        small : TileArray | None = None,
+        **kwargs,
+    ) -> Canvas:
+        canvas = cls(**kwargs)
+        if large is not None: canvas.large = cls.check_tile_array(large)
+        if small is not None: canvas.small = cls.check_tile_array(small)
+        return canvas
+
+    @staticmethod
+    def check_tile_array(tiles : TileArray) -> TileArray:
+        tiles = np.array(tiles, dtype=np.complex128)
+        assert (tiles.ndim == 2) and (tiles.shape[1] == 3), \
+            "Tile arrays must have shape (n, 3), with rows of (A, V, B) vertices."
+        return tiles
+
+    @staticmethod
+    def to_tile_array(tiles : CanvasElements) -> TileArray:
+        return np.array(
+            [(e.A, e.vertex, e.B) for e in tiles], dtype=np.complex128,
+        ).reshape(-1, 3)
+
+    @property
+    def elements(self) -> CanvasElements:
+        return [LargeTile._fast_new(*row) for row in self.large.tolist()] \
+            + [SmallTile._fast_new(*row) for row in self.small.tolist()]
+
+    def num_elements(self) -> int: return len(self.large) + len(self.small)
 
     def inflate(self) -> Self:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
-        new_elements = []
-        for e in self.elements: new_elements.extend(e.inflate())
-        self.elements = new_elements
-
-    def remove_duplicates(self) -> Self:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
-        sorted_elements = sorted(
-            self.elements,
-            key=lambda e : (e.rhombus_center().real, e.rhombus_center().imag)
+        assert self.num_elements() > 0, "Canvas is not yet initialized."
+        nL, nS = len(self.large), len(self.small)
+        large = np.empty(((2 * nL) + nS, 3), dtype=np.complex128)
+        small = np.empty((nL + nS, 3), dtype=np.complex128)
+        inflate_large(self.large, large[:2*nL], small[:nL])
+        inflate_small(self.small, small[nL:], large[2*nL:])
+        self.large, self.small = large, small
+        self.mirrored = None
+
+    @staticmethod
+    def rhombus_centers(tiles : TileArray) -> np.ndarray:
+        return (tiles[:, 0] + tiles[:, 2]) / 2
+
+    @staticmethod
+    def unique_by_sort(
+        centers : np.ndarray,
+        tol : float,
+    ) -> np.ndarray:
+        order = np.lexsort((centers.imag, centers.real))
+        d = np.diff(centers[order])
+        keep = ((d.real * d.real) + (d.imag * d.imag)) > tol**2
+        return order[np.concatenate(([True], keep))]
+
+    @staticmethod
+    def clusters_by_sort(
+        centers : np.ndarray,
+        tol : float,
+    ) -> np.ndarray:
+        order = np.lexsort((centers.imag, centers.real))
+        d = np.diff(centers[order])
+        labels = np.empty(len(centers), dtype=np.intp)
+        labels[order] = np.cumsum(np.concatenate((
+            [0], ((d.real * d.real) + (d.imag * d.imag)) > tol**2
+        )))
+        return labels
+
+    @staticmethod
+    def grid_keys(
+        centers : np.ndarray,
+        tol : float,
+    ) -> np.ndarray:
+        inv_tol = 1 / tol
+        qr = np.round(centers.real * inv_tol).astype(np.int64)
+        qi = np.round(centers.imag * inv_tol).astype(np.int64)
+        return (qr << 32) | (qi & 0xFFFFFFFF)
+
+    @classmethod
+    def unique_by_grid(
+        cls,
+        centers : np.ndarray,
+        tol : float,
+    ) -> np.ndarray:
+        _, idx = np.unique(cls.grid_keys(centers, tol), return_index=True)
+        return np.sort(idx)
+
+    @classmethod
+    def clusters_by_grid(
+        cls,
+        centers : np.ndarray,
+        tol : float,
+    ) -> np.ndarray:
+        _, labels = np.unique(cls.grid_keys(centers, tol), return_inverse=True)
+        return labels
+
+    def uses_grid(self, centers : np.ndarray) -> bool:
+        # Centers are snapped onto a grid whenever the tolerance is positive and the quantized
+        # coordinates fit in the 32 bits each of a packed key; otherwise they are sorted, and
+        # with a zero tolerance only exact matches are found
+        tol = self.config['equality-tol']
+        if (tol <= 0) or (len(centers) == 0): return False
+        return max(
+            np.round(np.abs(centers.real).max() / tol),
+            np.round(np.abs(centers.imag).max() / tol),
+        ) < 2**31
+
+    def cluster_centers(
+        self,
+        centers : np.ndarray,
+        use_grid : bool | None = None,
+    ) -> np.ndarray:
+        tol = self.config['equality-tol']
+        if use_grid is None: use_grid = self.uses_grid(centers)
+        return self.clusters_by_grid(centers, tol) if use_grid \
+            else self.clusters_by_sort(centers, tol)
+
+    def remove_duplicates(
+        self,
+        use_grid : bool | None = None,
+    ) -> Self:
+        assert self.num_elements() > 0, "Canvas is not yet initialized."
+        tiles = np.concatenate([self.large, self.small])
+        is_large = np.arange(len(tiles)) < len(self.large)
+        centers = self.rhombus_centers(tiles)
+        tol = self.config['equality-tol']
+
+        if use_grid is None: use_grid = self.uses_grid(centers)
+        idx = self.unique_by_grid(centers, tol) if use_grid \
+            else self.unique_by_sort(centers, tol)
+        self.large = tiles[idx[is_large[idx]]]
+        self.small = tiles[idx[~is_large[idx]]]
+        self.mirrored = None
+
+    def add_conjugate_elements(
+        self,
+        skip_duplicates : bool = False,
+        use_grid : bool | None = None,
+    ) -> Self:
+        assert self.num_elements() > 0, "Canvas is not yet initialized."
+        # Comparing rhombus centers is enough to leave out mirror images already on the
+        # canvas, so a deduplicated canvas need not be deduplicated again afterwards
+        large, small = self.large, self.small
+        if skip_duplicates:
+            self.mark_mirrored_elements(use_grid=use_grid)
+            large, small = large[self.mirrored[0]], small[self.mirrored[1]]
+        self.large = np.concatenate([self.large, large.conjugate()])
+        self.small = np.concatenate([self.small, small.conjugate()])
+        self.mirrored = None
+
+    def mark_mirrored_elements(
+        self,
+        use_grid : bool | None = None,
+    ) -> Self:
+        # Flag the elements whose mirror image about the x-axis is not yet on the canvas
+        assert self.num_elements() > 0, "Canvas is not yet initialized."
+        tiles = np.concatenate([self.large, self.small])
+        centers = self.rhombus_centers(tiles)
+        # A mirror image is new only if no element shares its cluster of coinciding centers
+        labels = self.cluster_centers(
+            np.concatenate([centers, centers.conjugate()]), use_grid=use_grid,
         )
-        self.elements = [sorted_elements[0]]
-        for i, e in enumerate(sorted_elements[1:], start=1):
-            if not isclose(
-                abs(e.rhombus_center() - sorted_elements[i-1].rhombus_center()), 0,
-                abs_tol=self.config['equality-tol']
-            ): self.elements.append(e)
+        has_element = np.zeros(labels.max() + 1, dtype=bool)
+        has_element[labels[:len(tiles)]] = True
+        mirrored = ~has_element[labels[len(tiles):]]
+        self.mirrored = (mirrored[:len(self.large)], mirrored[len(self.large):])
+        self.mirror_axis = complex(1, 0)
 
-    def add_conjugate_elements(self) -> Self:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
-        self.elements.extend([e.conjugate() for e in self.elements])
+    def _apply_affine(
+        self,
+        mult : complex | None = None,
+        conj : bool = False,
+        neg_real : bool = False,
+    ) -> Self:
+        assert self.num_elements() > 0, "Canvas is not yet initialized."
+        for tiles in (self.large, self.small):
+            if mult is not None: tiles *= mult
+            if conj: np.conjugate(tiles, out=tiles)
+            if neg_real: tiles.real = -tiles.real
+        # Keep the axis about which `mirrored` elements are reflected in step with the tiles
+        if mult is not None: self.mirror_axis *= mult / abs(mult)
+        if conj: self.mirror_axis = self.mirror_axis.conjugate()
+        if neg_real: self.mirror_axis = -self.mirror_axis.conjugate()
 
     def rotate(self) -> Self:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
-        rotator = complex(cos(self.config['rotation']), sin(self.config['rotation']))
-        for e in self.elements:
-            e.A *= rotator
-            e.vertex *= rotator
-            e.B *= rotator
-
-    def flip_about_yaxis(self) -> Self:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
-        for e in self.elements:
-            e.A = complex(-e.A.real, e.A.imag)
-            e.vertex = complex(-e.vertex, e.B.imag)
-            e.B = complex(-e.B.real, e.B.imag)
-
-    def flip_about_xaxis(self) -> Self:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
-        for e in self.elements:
-            e.A = e.A.conjugate()
-            e.vertex = e.vertex.conjugate()
-            e.B = e.B.conjugate()
+        theta = self.config['rotation']
+        self._apply_affine(mult=complex(cos(theta), sin(theta)))
+
+    def flip_about_yaxis(self) -> Self: self._apply_affine(neg_real=True)
+
+    def flip_about_xaxis(self) -> Self: self._apply_affine(conj=True)
+
+    def finalize_tiling(self) -> Self:
+        # Decide on grid or sort once, so that every duplicate check below agrees on what
+        # a duplicate is; mirror images lie no farther from the axes than the tiles do
+        use_grid = self.uses_grid(
+            self.rhombus_centers(np.concatenate([self.large, self.small])),
+        )
+        self.remove_duplicates(use_grid=use_grid)
+        if self.config['reflect-x']:
+            if self.config['reflect-x-by-reference']:
+                self.mark_mirrored_elements(use_grid=use_grid)
+            else: self.add_conjugate_elements(skip_duplicates=True, use_grid=use_grid)
+        if self.config['rotation']: self.rotate()
 
     def make_tiling(self) -> Self:
+        # Tiles sharing a rhombus center are mirror-image halves that inflate into different
+        # children, so duplicates can only be removed after the last generation
         for _ in range(self.num_generations): self.inflate()
-        self.remove_duplicates()
-        if self.config['reflect-x']: self.add_conjugate_elements(); self.remove_duplicates()
-        if self.config['rotation']: self.rotate()
+        self.finalize_tiling()
+
+    def copy(self) -> Canvas:
+        other = shallow_copy(self)
+        other.config = dict(self.config)
+        other.large, other.small = self.large.copy(), self.small.copy()
+        return other
+
+    @staticmethod
+    def get_SVG_paths(
+        tiles : TileArray,
+        color : str,
+        opacity : float,
+    ) -> list[str]:
+        A = tiles[:, 0]
+        AV, VB = tiles[:, 1] - A, tiles[:, 2] - tiles[:, 1]
+        prefix = f'<path fill="{color}" fill-opacity="{opacity}" d="'
+        # Each coordinate is formatted once; the closing `-AV` segment reuses the `AV` strings
+        return [
+            f'{prefix}m{ar},{ai} l{avr},{avi} l{vbr},{vbi} '
+            f'l{_negated(avr)},{_negated(avi)}z"/>'
+            for (ar, ai, avr, avi, vbr, vbi) in zip(*(
+                map(repr, x.tolist())
+                for x in (A.real, A.imag, AV.real, AV.imag, VB.real, VB.imag)
+            ))
+        ]
 
-    def get_tile_color(
+    def _iter_path_chunks(
         self,
-        tile : LargeTile | SmallTile,
-    ) -> str:
-        return self.config['large-tile-color'] if isinstance(tile, LargeTile) \
-            else self.config['small-tile-color']
+        large : TileArray,
+        small : TileArray,
+        chunk_size : int,
+    ) -> Iterator[str]:
+        for (tiles, kind) in ((large, "large"), (small, "small")):
+            for i in range(0, len(tiles), chunk_size):
+                yield "\n" + "\n".join(self.get_SVG_paths(
+                    tiles[i:i+chunk_size],
+                    self.config[f'{kind}-tile-color'], self.config[f'{kind}-tile-opacity'],
+                ))
 
-    def get_SVG_code(self) -> str:
-        assert len(self.elements) > 0, "Canvas is not yet initialized."
+    def iter_svg_chunks(
+        self,
+        chunk_size : int = 65536,
+    ) -> Iterator[str]:
+        assert self.num_elements() > 0, "Canvas is not yet initialized."
         x_min = y_min = -self.scale * (1 + self.config['margin'])
         width = height = 2 * self.scale * (1 + self.config['margin'])
         viewBox = f"{x_min} {y_min} {width} {height}"
+        psi_pow = PSI_POW[self.num_generations] if self.num_generations < len(PSI_POW) \
+            else PSI**self.num_generations
 
-        svg = [
+        yield "\n".join([
             '<?xml version="1.0" encoding="utf-8"?>',
             (
                 '<svg width="100%" height="100%" viewBox="{}"'
                 ' preserveAspectRatio="xMidYMid meet" version="1.1"'
-                ' baseProfile="full" xmlns="http://www.w3.org/2000/svg">'
-            ).format(viewBox)
-        ]
-        svg.append('<g style="stroke:{}; stroke-width: {}; stroke-linejoin: round;">'.format(
-            self.config['stroke-color'], str(0.03 * (PSI**self.num_generations) * self.scale)
-        ))
-        for e in self.elements:
-            svg.append('<path fill="{}" fill-opacity="{}" d="{}"/>'.format(
-                self.get_tile_color(e),
-                self.config['large-tile-opacity'] if isinstance(e, LargeTile) \
-                    else self.config['small-tile-opacity'],
-                e.rhombus_path()
-            ))
-        svg.append('</g>\n</svg>')
+                ' baseProfile="full" xmlns="http://www.w3.org/2000/svg"{}>'
+            ).format(
+                viewBox,
+                '' if self.mirrored is None
+                else ' xmlns:xlink="http://www.w3.org/1999/xlink"',
+            ),
+            '<g style="stroke:{}; stroke-width: {}; stroke-linejoin: round;">'.format(
+                self.config['stroke-color'], str(0.03 * psi_pow * self.scale)
+            ),
+        ])
+        if self.mirrored is None:
+            yield from self._iter_path_chunks(self.large, self.small, chunk_size)
+        else:
+            (mL, mS), w = self.mirrored, self.mirror_axis**2
+            yield from self._iter_path_chunks(self.large[~mL], self.small[~mS], chunk_size)
+            yield '\n<g id="tiles">'
+            yield from self._iter_path_chunks(self.large[mL], self.small[mS], chunk_size)
+            yield (
+                '\n</g>\n<use xlink:href="#tiles"'
+                ' transform="matrix({} {} {} {} 0 0)"/>'
+            ).format(w.real, w.imag, w.imag, -w.real)
+        yield '\n</g>\n</svg>'
 
-        return "\n".join(svg)
+    def get_SVG_code(self) -> str: return "".join(self.iter_svg_chunks())
 
     def export_svg(
         self,
@@ -181,4 +401,5 @@ class Canvas:
         save_dir : PathLike = "./",
     ) -> None:
         save_dir = Path(save_dir); save_dir.mkdir(parents=True, exist_ok=True)
-        save_dir.joinpath(f"{filename}.svg").write_text(self.get_SVG_code())
+        with save_dir.joinpath(f"{filename}.svg").open("w", buffering=1<<20) as f:
+            for chunk in self.iter_svg_chunks(): f.write(chunk)
@@ -12,9 +12,11 @@ from __future__ import annotations
 
 from math import sqrt
 
-__all__ = ["PHI", "PSI", "PHI_SQUARED", "PSI_SQUARED"]
+__all__ = ["SQRT5", "PHI", "PSI", "PHI_SQUARED", "PSI_SQUARED", "PSI_POW"]
 
-PHI = (sqrt(5) + 1) / 2
-PSI = (sqrt(5) - 1) / 2
-PHI_SQUARED = 1.5 + (0.5*sqrt(5))
+SQRT5 = sqrt(5)
+PHI = 0.5 * (SQRT5 + 1)
+PSI = 0.5 * (SQRT5 - 1)
+PHI_SQUARED = PHI + 1
 PSI_SQUARED = 1 - PSI
+PSI_POW = tuple(PSI**k for k in range(32))
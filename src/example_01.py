@@ -55,14 +55,16 @@ if __name__ == "__main__":
         ),
     ]
 
+    canvas = Canvas(
+        scale=args.scale,
+        starting_tiles=starting_tiles,
+    )
     for num_generations in range(args.num_generations+1):
-        canvas = Canvas(
-            scale=args.scale,
-            num_generations=max(1, num_generations),
-            starting_tiles=starting_tiles,
-        )
-        if num_generations: canvas.make_tiling()
-        canvas.export_svg(
+        if num_generations: canvas.inflate()
+        snapshot = canvas.copy()
+        snapshot.num_generations = max(1, num_generations)
+        if num_generations: snapshot.finalize_tiling()
+        snapshot.export_svg(
             filename=f"{num_generations:02d}",
             save_dir=f"{args.save_dir}/{FILENAME_PREFIX}",
         )
@@ -14,8 +14,9 @@ from pathlib import Path
 import pickle as pkl
 
 import math
+import numpy as np
 
-from core import SmallTile, Canvas
+from core import Canvas
 
 FILENAME_PREFIX = "example-02"
 
@@ -50,29 +51,21 @@ if __name__ == "__main__":
 
     theta = math.pi / 5
     rotator = complex(math.cos(theta), math.sin(theta))
-    V = complex(0, 0)
-    A1 = complex(0.5 * args.scale, 0)
-    B1 = B2 = (A1 * rotator)
-    A2 = A3 = (B1 * rotator)
-    B3 = B4 = (A3 * rotator)
-    A4 = A5 = (B4 * rotator)
-    B5 = -A1
-    starting_tiles = [
-        SmallTile(A1, V, B1),
-        SmallTile(A2, V, B2),
-        SmallTile(A3, V, B3),
-        SmallTile(A4, V, B4),
-        SmallTile(A5, V, B5),
-    ]
+    # Neighbouring tiles are mirror images, so they alternately share their A and B vertices
+    k = np.arange(5)
+    A = complex(0.5 * args.scale, 0) * (rotator ** (2 * ((k + 1) // 2)))
+    B = complex(0.5 * args.scale, 0) * (rotator ** ((2 * (k // 2)) + 1))
 
+    canvas = Canvas.from_arrays(
+        small=np.stack([A, np.zeros(5), B], axis=1),
+        scale=args.scale,
+    )
     for num_generations in range(args.num_generations+1):
-        canvas = Canvas(
-            scale=args.scale,
-            num_generations=max(1, num_generations),
-            starting_tiles=starting_tiles,
-        )
-        if num_generations: canvas.make_tiling()
-        canvas.export_svg(
+        if num_generations: canvas.inflate()
+        snapshot = canvas.copy()
+        snapshot.num_generations = max(1, num_generations)
+        if num_generations: snapshot.finalize_tiling()
+        snapshot.export_svg(
             filename=f"{num_generations:02d}",
             save_dir=f"{args.save_dir}/{FILENAME_PREFIX}",
         )
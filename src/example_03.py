@@ -14,8 +14,9 @@ from pathlib import Path
 import pickle as pkl
 
 import math
+import numpy as np
 
-from core import PHI, PHI_SQUARED, LargeTile, Canvas
+from core import PHI, PHI_SQUARED, Canvas
 
 FILENAME_PREFIX = "example-03"
 
@@ -58,19 +59,19 @@ if __name__ == "__main__":
         PHI*0.25*args.scale,
         math.sqrt((0.25 * (args.scale**2)) - (PHI_SQUARED * 0.0625 * (args.scale**2)))
     )
-    As = [_a * complex(math.cos(i*theta), math.sin(i*theta)) for i in range(5)]
-    Vs = [_v * complex(math.cos(i*theta), math.sin(i*theta)) for i in range(5)]
-    starting_tiles = [LargeTile(a, v, complex(0, 0)) for (a, v) in zip(As, Vs)]
+    rotators = np.exp(1j * theta * np.arange(5))
 
+    canvas = Canvas.from_arrays(
+        large=np.stack([_a * rotators, _v * rotators, np.zeros(5)], axis=1),
+        scale=args.scale,
+        config={"rotation" : math.radians(args.rotation)}
+    )
     for num_generations in range(args.num_generations+1):
-        canvas = Canvas(
-            scale=args.scale,
-            num_generations=max(1, num_generations),
-            starting_tiles=starting_tiles,
-            config={"rotation" : math.radians(args.rotation)}
-        )
-        if num_generations: canvas.make_tiling()
-        canvas.export_svg(
+        if num_generations: canvas.inflate()
+        snapshot = canvas.copy()
+        snapshot.num_generations = max(1, num_generations)
+        if num_generations: snapshot.finalize_tiling()
+        snapshot.export_svg(
             filename=f"{num_generations:02d}",
             save_dir=f"{args.save_dir}/{FILENAME_PREFIX}/{args.rotation}",
         )